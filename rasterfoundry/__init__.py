@@ -8,6 +8,13 @@ try:
 except ImportError:
     NOTEBOOK_SUPPORT = False
 
+# Flag to indicate whether on-disk HTTP caching is available
+try:
+    import requests_cache  # NOQA
+    HTTP_CACHE_SUPPORT = True
+except ImportError:
+    HTTP_CACHE_SUPPORT = False
+
 # Bravado spits out useless warnings by default, this is to silence them
 SHOW_WARNINGS = os.getenv("SHOW_WARNINGS_RF", False)
 
@@ -1,34 +1,165 @@
+import copy
+import hashlib
 import json
+import logging
 import os
+import pickle
+import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from bravado.client import SwaggerClient
 from bravado.requests_client import RequestsClient
 from bravado.swagger_model import load_file, load_url
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 from simplejson import JSONDecodeError
+from urllib3.util.retry import Retry
 
 
+from . import HTTP_CACHE_SUPPORT
 from .aws.s3 import str_to_file
+from .decorators import cached_response
 from .exceptions import RefreshTokenException
 from .models import Analysis, MapToken, Project, Export, Datasource
-from .settings import RV_TEMP_URI
+from .settings import (
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_EXPIRE_AFTER,
+    HTTP_CACHE_MAX_AGE,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+    RV_TEMP_URI,
+    SPEC_CACHE_DIR,
+)
+from .utils import (
+    get_all_paginated_parallel,
+    iter_paginated,
+    match_annotations_uris,
+    mkdir_p,
+)
+
+if HTTP_CACHE_SUPPORT:
+    import requests_cache
 
 try:
     from urllib.parse import urlparse
 except ImportError:
     from urlparse import urlparse
 
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
 SPEC_PATH = os.getenv(
     'RF_API_SPEC_PATH',
     'https://raw.githubusercontent.com/raster-foundry/raster-foundry-api-spec/1.16.0/spec/spec.yml'  # NOQA
 )
 
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 64
+PROJECT_CONFIG_MAX_WORKERS = 16
+# Query parameters that, if the spec has them, filter the project list by id
+PROJECT_ID_FILTER_PARAMS = ('ids', 'uuid__in')
+
+# Parsed specs keyed by path, so the spec is only fetched and parsed once
+_SPEC_CACHE = {}
+
+
+def get_spec(spec_path=SPEC_PATH):
+    """Get the parsed swagger spec, loading it on first use
+
+    Args:
+        spec_path (str): url or local file path of the spec
+
+    Returns:
+        dict: a copy of the spec that is safe for the caller to modify
+    """
+    if spec_path not in _SPEC_CACHE:
+        if urlparse(spec_path).netloc:
+            _SPEC_CACHE[spec_path] = load_url(spec_path)
+        else:
+            _SPEC_CACHE[spec_path] = load_spec_file(spec_path)
+    return copy.deepcopy(_SPEC_CACHE[spec_path])
+
+
+def load_spec_file(spec_path):
+    """Load a local spec file, preferring a pickled copy parsed earlier
+
+    Parsing YAML is slow, so the parsed spec is pickled into a cache
+    directory under the user's home. The pickle's name includes the spec's
+    path, modification time, and size, so it is only reused while all of
+    them match exactly. Pickles are never read from next to the spec, since
+    anyone who can write there could otherwise run code on load. If the
+    pickle can't be read or written, the spec is just parsed.
+
+    Args:
+        spec_path (str): local file path of the spec
+
+    Returns:
+        dict
+    """
+    spec_path = os.path.abspath(spec_path)
+    spec_stat = os.stat(spec_path)
+    path_key = hashlib.sha256(spec_path.encode('utf-8')).hexdigest()[:16]
+    version_key = hashlib.sha256('{!r}:{}'.format(
+        spec_stat.st_mtime, spec_stat.st_size).encode('utf-8')).hexdigest()[:16]
+    pickle_prefix = 'spec_{}_'.format(path_key)
+    pickle_path = os.path.join(
+        SPEC_CACHE_DIR, '{}{}.pkl'.format(pickle_prefix, version_key))
+    try:
+        with open(pickle_path, 'rb') as pickle_file:
+            return pickle.load(pickle_file)
+    except (EnvironmentError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    spec = load_file(spec_path)
+
+    tmp_path = None
+    try:
+        mkdir_p(SPEC_CACHE_DIR)
+        os.chmod(SPEC_CACHE_DIR, 0o700)
+        # Drop pickles of earlier versions of this spec
+        for filename in os.listdir(SPEC_CACHE_DIR):
+            if filename.startswith(pickle_prefix):
+                os.remove(os.path.join(SPEC_CACHE_DIR, filename))
+        fd, tmp_path = tempfile.mkstemp(dir=SPEC_CACHE_DIR)
+        with os.fdopen(fd, 'wb') as pickle_file:
+            pickle.dump(spec, pickle_file, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_path, pickle_path)
+    except EnvironmentError:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return spec
+
+
+def prune_http_cache(keep=None):
+    """Delete HTTP cache files that haven't been written to recently
+
+    Args:
+        keep (str): optional cache name to leave in place regardless of age
+    """
+    cutoff = time.time() - HTTP_CACHE_MAX_AGE
+    for filename in os.listdir(HTTP_CACHE_DIR):
+        name = os.path.splitext(filename)[0]
+        if not name.startswith('rf_api_cache_') or name == keep:
+            continue
+        path = os.path.join(HTTP_CACHE_DIR, filename)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except EnvironmentError:
+            pass
+
 
 class API(object):
     """Class to interact with Raster Foundry API"""
 
     def __init__(self, refresh_token=None, api_token=None,
-                 host='app.rasterfoundry.com', scheme='https'):
+                 host='app.rasterfoundry.com', scheme='https', cache=False):
         """Instantiate an API object to make requests to Raster Foundry's REST API
 
         Args:
@@ -37,16 +168,21 @@ class API(object):
             api_token (str): optional token used to authenticate API requests
             host (str): optional host to use to make API requests against
             scheme (str): optional scheme to override making requests with
+            cache (bool): optionally cache GET responses on disk so they can
+                          be reused across processes; requires requests-cache
         """
 
         self.http = RequestsClient()
         self.scheme = scheme
 
-        if urlparse(SPEC_PATH).netloc:
-            spec = load_url(SPEC_PATH)
-        else:
-            spec = load_file(SPEC_PATH)
+        self._configure_session(self.http.session)
 
+        # Short-lived cache for read-mostly listings, see `invalidate_cache`
+        self._response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE,
+                                        ttl=RESPONSE_CACHE_TTL)
+        self._response_cache_lock = threading.Lock()
+
+        spec = get_spec()
         self.app_host = host
         spec['host'] = host
         spec['schemes'] = [scheme]
@@ -65,9 +201,53 @@ class API(object):
             raise Exception('Must provide either a refresh token or API token')
 
         self.api_token = api_token
+        if cache:
+            self._use_http_cache(refresh_token or api_token)
         self.http.session.headers['Authorization'] = 'Bearer {}'.format(
             api_token)
 
+    def _configure_session(self, session):
+        # Share one warm connection pool across the app and tiles hosts so
+        # paginated and concurrent requests don't pay for a new handshake
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504],
+                              raise_on_status=False))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+
+    def _use_http_cache(self, token):
+        """Switch to a session that caches GET responses on disk
+
+        Responses are cached in a separate file per token, since the cache
+        key doesn't include the Authorization header. Refresh tokens are
+        long-lived, so passing one keeps reusing the same cache file. Files
+        for API tokens go stale when the token expires; any cache file not
+        written to in HTTP_CACHE_MAX_AGE seconds is deleted. Server
+        Cache-Control and ETag headers are honored, and non-GET requests
+        aren't cached.
+
+        Args:
+            token (str): refresh or API token identifying the cache file
+        """
+        if not HTTP_CACHE_SUPPORT:
+            logging.warn('HTTP caching requires requests-cache')
+            return
+
+        mkdir_p(HTTP_CACHE_DIR)
+        cache_name = 'rf_api_cache_{}'.format(
+            hashlib.sha256(token.encode('utf-8')).hexdigest()[:16])
+        prune_http_cache(keep=cache_name)
+        session = requests_cache.CachedSession(
+            cache_name=os.path.join(HTTP_CACHE_DIR, cache_name),
+            backend='sqlite', expire_after=HTTP_CACHE_EXPIRE_AFTER,
+            cache_control=True)
+        self._configure_session(session)
+        self.http.session = session
+
     def get_api_token(self, refresh_token):
         """Retrieve API token given a refresh token
 
@@ -88,47 +268,71 @@ class API(object):
             raise RefreshTokenException('Error using refresh token, please '
                                         'verify it is valid')
 
+    def invalidate_cache(self):
+        """Clear cached responses so the next requests fetch fresh data
+
+        Map tokens, projects, datasources, and scene searches are cached for
+        a short time to avoid repeating identical requests.
+        """
+        with self._response_cache_lock:
+            self._response_cache.clear()
+
+    def _get_map_tokens_page(self, page):
+        return self.client.Imagery.get_map_tokens(page=page).result()
+
+    def _get_projects_page(self, page, **kwargs):
+        return self.client.Imagery.get_projects(page=page, **kwargs).result()
+
+    def iter_map_tokens(self):
+        """Iterate over map tokens a user has access to
+
+        Unlike `map_tokens`, pages are requested one at a time as they're
+        needed, so this is cheaper when only some map tokens are used.
+
+        Yields:
+            MapToken
+        """
+        for map_token in iter_paginated(self._get_map_tokens_page):
+            yield MapToken(map_token, self)
+
+    def iter_projects(self):
+        """Iterate over projects a user has access to
+
+        Unlike `projects`, pages are requested one at a time as they're
+        needed, so this is cheaper when only some projects are used.
+
+        Yields:
+            Project
+        """
+        for project in iter_paginated(self._get_projects_page):
+            yield Project(project, self)
+
     @property
+    @cached_response
     def map_tokens(self):
         """List map tokens a user has access to
 
         Returns:
             List[MapToken]
         """
-
-        has_next = True
-        page = 0
-        map_tokens = []
-        while has_next:
-            paginated_map_tokens = (
-                self.client.Imagery.get_map_tokens(page=page).result()
-            )
-            map_tokens += [
-                MapToken(map_token, self)
-                for map_token in paginated_map_tokens.results
-            ]
-            page = paginated_map_tokens.page + 1
-            has_next = paginated_map_tokens.hasNext
-        return map_tokens
+        return [
+            MapToken(map_token, self)
+            for map_token in get_all_paginated_parallel(
+                self._get_map_tokens_page)
+        ]
 
     @property
+    @cached_response
     def projects(self):
         """List projects a user has access to
 
         Returns:
             List[Project]
         """
-        has_next = True
-        projects = []
-        page = 0
-        while has_next:
-            paginated_projects = self.client.Imagery.get_projects(
-                page=page).result()
-            has_next = paginated_projects.hasNext
-            page = paginated_projects.page + 1
-            for project in paginated_projects.results:
-                projects.append(Project(project, self))
-        return projects
+        return [
+            Project(project, self)
+            for project in get_all_paginated_parallel(self._get_projects_page)
+        ]
 
     @property
     def analyses(self):
@@ -144,8 +348,10 @@ class API(object):
             paginated_analyses = self.client.Lab.get_tool_runs(page=page).result()
             has_next = paginated_analyses.hasNext
             page = paginated_analyses.page + 1
-            for analysis in paginated_analyses.results:
-                analyses.append(Analysis(analysis, self))
+            analyses.extend(
+                Analysis(analysis, self)
+                for analysis in paginated_analyses.results
+            )
         return analyses
 
     @property
@@ -162,10 +368,12 @@ class API(object):
             paginated_exports = self.client.Imagery.get_exports(page=page).result()
             has_next = paginated_exports.hasNext
             page = paginated_exports.page + 1
-            for export in paginated_exports.results:
-                exports.append(Export(export, self))
+            exports.extend(
+                Export(export, self) for export in paginated_exports.results
+            )
         return exports
 
+    @cached_response
     def get_datasources(self):
         datasources = []
         for datasource in self.client.Datasources.get_datasources().result().results:
@@ -176,12 +384,15 @@ class API(object):
         return self.client.Datasources.get_datasources_datasourceID(
             datasourceID=datasource_id).result()
 
+    @cached_response
     def get_scenes(self, **kwargs):
         bbox = kwargs.get('bbox')
-        if bbox and hasattr(bbox, 'bounds'):
-            kwargs['bbox'] = ','.join(str(x) for x in bbox.bounds)
-        elif bbox and type(bbox) != type(','.join(str(x) for x in bbox)): # NOQA
-            kwargs['bbox'] = ','.join(str(x) for x in bbox)
+        if bbox and not isinstance(bbox, string_types):
+            coords = bbox.bounds if hasattr(bbox, 'bounds') else bbox
+            if len(coords) != 4:
+                raise ValueError(
+                    'bbox must have 4 coordinates, got {}'.format(len(coords)))
+            kwargs['bbox'] = '{},{},{},{}'.format(*coords)
         return self.client.Imagery.get_scenes(**kwargs).result()
 
     def get_project_config(self, project_ids, annotations_uris=None):
@@ -200,28 +411,98 @@ class API(object):
         Returns:
             Object of form [{'images': [...], 'annotations':...}, ...]
         """
-        project_configs = []
-        for project_ind, project_id in enumerate(project_ids):
-            proj = Project(
-                self.client.Imagery.get_projects_projectID(projectID=project_id).result(),
-                self)
-
-            if annotations_uris is None:
-                annotations_uri = os.path.join(
-                    RV_TEMP_URI, 'annotations', '{}.json'.format(uuid.uuid4()))
-                proj.save_annotations_json(annotations_uri)
-            else:
-                annotations_uri = annotations_uris[project_ind]
+        annotations_uris = match_annotations_uris(
+            project_ids, annotations_uris)
 
-            image_uris = proj.get_image_source_uris()
-            project_configs.append({
-                'id': project_id,
-                'images': image_uris,
-                'annotations': annotations_uri
-            })
+        if not project_ids:
+            return []
+
+        projects = self.get_projects_by_id(project_ids)
+        max_workers = min(PROJECT_CONFIG_MAX_WORKERS, len(project_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            project_configs = list(executor.map(
+                self._build_project_config, project_ids, projects,
+                annotations_uris))
 
         return project_configs
 
+    def get_projects_by_id(self, project_ids):
+        """Get several projects, in the same order as their ids
+
+        If the spec allows filtering the project list by id, the projects
+        are fetched with one filtered listing. Otherwise, or for any ids the
+        listing didn't return, they are fetched one at a time concurrently.
+
+        Args:
+            project_ids: list of project ids to get
+
+        Returns:
+            List[Project]
+        """
+        if not project_ids:
+            return []
+
+        def get_project(project_id):
+            return self.client.Imagery.get_projects_projectID(
+                projectID=project_id).result()
+
+        unique_ids = []
+        for project_id in project_ids:
+            if project_id not in unique_ids:
+                unique_ids.append(project_id)
+
+        projects_by_id = {}
+        list_params = self.client.swagger_spec.resources['Imagery'].operations[
+            'get_projects'].params
+        filter_param = next(
+            (list_params[name] for name in PROJECT_ID_FILTER_PARAMS
+             if name in list_params),
+            None)
+        if filter_param is not None:
+            if filter_param.param_spec.get('type') == 'array':
+                ids_filter = unique_ids
+            else:
+                ids_filter = ','.join(unique_ids)
+
+            def get_page(page):
+                return self._get_projects_page(
+                    page, **{filter_param.name: ids_filter})
+
+            for project in get_all_paginated_parallel(get_page):
+                projects_by_id[project.id] = project
+
+        missing_ids = [
+            project_id for project_id in unique_ids
+            if project_id not in projects_by_id
+        ]
+        if missing_ids:
+            max_workers = min(PROJECT_CONFIG_MAX_WORKERS, len(missing_ids))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                projects_by_id.update(
+                    zip(missing_ids, executor.map(get_project, missing_ids)))
+
+        return [
+            Project(projects_by_id[project_id], self)
+            for project_id in project_ids
+        ]
+
+    def _build_project_config(self, project_id, proj, annotations_uri=None):
+        """Build the project config entry for a single project
+
+        If annotations_uri is not specified, an annotation file for the
+        project is generated and saved to S3.
+        """
+        if annotations_uri is None:
+            annotations_uri = os.path.join(
+                RV_TEMP_URI, 'annotations', '{}.json'.format(uuid.uuid4()))
+            proj.save_annotations_json(annotations_uri)
+
+        return {
+            'id': project_id,
+            'images': proj.get_image_source_uris(),
+            'annotations': annotations_uri
+        }
+
     def save_project_config(self, project_ids, output_uri,
                             annotations_uris=None):
         """Save project config file.
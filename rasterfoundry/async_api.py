@@ -0,0 +1,193 @@
+"""Asyncio client for bulk reads against the Raster Foundry API
+
+Requires Python 3.5+ and aiohttp, which can be installed with
+``pip install rasterfoundry[async]``.
+"""
+import asyncio
+import re
+
+import aiohttp
+from bravado_core.unmarshal import unmarshal_schema_object
+
+from .api import API, HTTP_POOL_MAXSIZE
+from .models import MapToken, Project
+from .utils import get_remaining_pages, match_annotations_uris
+
+
+class AsyncAPI(object):
+    """Class to make concurrent requests to Raster Foundry API with asyncio
+
+    Listing requests are made directly with aiohttp instead of through
+    bravado. Results are wrapped in the same models as `API`, which is used
+    for authentication and for any follow-up requests made by the models.
+    """
+
+    def __init__(self, refresh_token=None, api_token=None,
+                 host='app.rasterfoundry.com', scheme='https',
+                 limit=HTTP_POOL_MAXSIZE):
+        """Instantiate an AsyncAPI object to make requests to Raster Foundry
+
+        Args:
+            refresh_token (str): optional token used to obtain an API token to
+                                 make API requests
+            api_token (str): optional token used to authenticate API requests
+            host (str): optional host to use to make API requests against
+            scheme (str): optional scheme to override making requests with
+            limit (int): maximum number of simultaneous connections
+        """
+
+        self.api = API(refresh_token=refresh_token, api_token=api_token,
+                       host=host, scheme=scheme)
+        self.swagger_spec = self.api.client.swagger_spec
+        self.base_url = '{}://{}{}'.format(
+            scheme, host, self.swagger_spec.spec_dict.get('basePath', ''))
+        self.limit = limit
+        self._session = None
+        self._project_path = self._find_project_path()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def session(self):
+        """aiohttp session shared by every request this object makes"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit,
+                                               ttl_dns_cache=300),
+                headers={
+                    'Authorization': 'Bearer {}'.format(self.api.api_token)
+                })
+        return self._session
+
+    async def close(self):
+        """Close the underlying aiohttp session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, path, **params):
+        url = '{}{}'.format(self.base_url, path)
+        async with self.session.get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def _get_all_paginated(self, path):
+        paginated_results = await self._get(path, page=0)
+        all_results = list(paginated_results['results'])
+        if not paginated_results['hasNext']:
+            return all_results
+
+        pages = await asyncio.gather(*[
+            self._get(path, page=page)
+            for page in get_remaining_pages(
+                paginated_results['page'], paginated_results['count'],
+                paginated_results['pageSize'])
+        ])
+        for paginated_results in pages:
+            all_results.extend(paginated_results['results'])
+
+        while paginated_results['hasNext']:
+            paginated_results = await self._get(
+                path, page=paginated_results['page'] + 1)
+            all_results.extend(paginated_results['results'])
+
+        return all_results
+
+    def _get_path(self, operation_id):
+        return self.swagger_spec.resources['Imagery'].operations[
+            operation_id].path_name
+
+    def _find_project_path(self):
+        # The single project operation's name follows its path parameter,
+        # which has changed between spec versions, so match on the path
+        projects_path = self._get_path('get_projects')
+        pattern = re.compile(r'^{}\{{\w+\}}/$'.format(
+            re.escape(projects_path)))
+        operations = self.swagger_spec.resources['Imagery'].operations
+        for operation in operations.values():
+            if operation.http_method != 'get':
+                continue
+            if pattern.match(operation.path_name):
+                return re.sub(r'\{\w+\}', '{}', operation.path_name)
+        raise ValueError('Spec has no operation to get a single project')
+
+    def _to_model(self, definition, obj):
+        return unmarshal_schema_object(
+            self.swagger_spec,
+            self.swagger_spec.spec_dict['definitions'][definition], obj)
+
+    async def map_tokens(self):
+        """List map tokens a user has access to
+
+        Returns:
+            List[MapToken]
+        """
+        map_tokens = [
+            self._to_model('MapToken', map_token)
+            for map_token in await self._get_all_paginated(
+                self._get_path('get_map_tokens'))
+        ]
+
+        # MapToken looks up its project synchronously, so keep that off the
+        # event loop
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, lambda: [
+            MapToken(map_token, self.api) for map_token in map_tokens
+        ])
+
+    async def projects(self):
+        """List projects a user has access to
+
+        Returns:
+            List[Project]
+        """
+        return [
+            Project(self._to_model('Project', project), self.api)
+            for project in await self._get_all_paginated(
+                self._get_path('get_projects'))
+        ]
+
+    async def get_project(self, project_id):
+        """Get a single project
+
+        Args:
+            project_id (str): id of the project to fetch
+
+        Returns:
+            Project
+        """
+        project = await self._get(self._project_path.format(project_id))
+        return Project(self._to_model('Project', project), self.api)
+
+    async def get_project_config(self, project_ids, annotations_uris=None):
+        """Get data needed to create project config file for prep_train_data
+
+        See `API.get_project_config`. Projects are fetched concurrently;
+        annotation and image source lookups still go through bravado and are
+        run in the default executor.
+
+        Args:
+            project_ids: list of project ids to make training data from
+            annotations_uris: optional list of corresponding annotation URIs
+
+        Returns:
+            Object of form [{'images': [...], 'annotations':...}, ...]
+        """
+        annotations_uris = match_annotations_uris(
+            project_ids, annotations_uris)
+
+        projects = await asyncio.gather(*[
+            self.get_project(project_id) for project_id in project_ids
+        ])
+
+        loop = asyncio.get_event_loop()
+        return list(await asyncio.gather(*[
+            loop.run_in_executor(None, self.api._build_project_config,
+                                 project_id, proj, annotations_uri)
+            for project_id, proj, annotations_uri
+            in zip(project_ids, projects, annotations_uris)
+        ]))
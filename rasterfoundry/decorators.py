@@ -1,3 +1,4 @@
+import functools
 import logging
 
 from . import NOTEBOOK_SUPPORT
@@ -12,3 +13,28 @@ def check_notebook(f):
         return no_op
     else:
         return f
+
+
+def cached_response(f):
+    """Cache the result of an API method in the instance's response cache
+
+    Results are keyed by method name and arguments. Calls with unhashable
+    arguments skip the cache. Lists are copied on the way out so callers
+    can't modify the cached value.
+    """
+    @functools.wraps(f)
+    def wrapper(self, *args, **kwargs):
+        key = (f.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return f(self, *args, **kwargs)
+
+        with self._response_cache_lock:
+            value = self._response_cache.get(key)
+        if value is None:
+            value = f(self, *args, **kwargs)
+            with self._response_cache_lock:
+                self._response_cache[key] = value
+        return list(value) if isinstance(value, list) else value
+    return wrapper
@@ -69,14 +69,21 @@ class Datasource(object):
                 }
             }
         )
-        return api.client.Datasources.post_datasources(datasource=datasource_created).result()
+        datasource = api.client.Datasources.post_datasources(
+            datasource=datasource_created).result()
+        api.invalidate_cache()
+        return datasource
 
     @classmethod
     def update(cls, api, datasource_id, datasource):
-        return api.client.Datasources.put_datasources_datasourceID(
+        updated = api.client.Datasources.put_datasources_datasourceID(
             datasourceID=datasource_id, datasource=datasource).result()
+        api.invalidate_cache()
+        return updated
 
     @classmethod
     def delete(cls, api, datasource_id):
-        return api.client.Datasources.delete_datasources_datasourceID(
+        deleted = api.client.Datasources.delete_datasources_datasourceID(
             datasourceID=datasource_id).result()
+        api.invalidate_cache()
+        return deleted
@@ -14,6 +14,11 @@ from ..decorators import check_notebook
 from ..exceptions import GatewayTimeoutException
 from ..utils import get_all_paginated
 
+try:
+    from shlex import quote as shell_quote
+except ImportError:
+    from pipes import quote as shell_quote
+
 if NOTEBOOK_SUPPORT:
     from ipyleaflet import (
         Map,
@@ -57,7 +62,10 @@ class Project(object):
         Returns:
             Project: created object in Raster Foundry
         """
-        return api.client.Imagery.post_projects(project=project_create)
+        project = api.client.Imagery.post_projects(
+            project=project_create).result()
+        api.invalidate_cache()
+        return project
 
     def get_center(self):
         """Get the center of this project's extent"""
@@ -261,14 +269,15 @@ class Project(object):
         Returns:
             job_id (str): job_id of job started on Batch
         """
-        source_uris = self.get_image_source_uris()
-        source_uris_str = ' '.join(source_uris)
-        channel_order = ' '.join([str(channel) for channel in channel_order])
         # Add uuid to job_name because it has to be unique.
-        job_name = 'predict_project_{}_{}'.format(self.id, uuid.uuid1())
-        command = 'python -m rv.detection.run predict --channel-order {} {} {} {} {}'.format(  # noqa
-            channel_order, inference_graph_uri, label_map_uri, source_uris_str,
-            predictions_uri)
+        job_name = 'predict_project_{}_{}'.format(self.id, uuid.uuid4().hex)
+        parts = ['python', '-m', 'rv.detection.run', 'predict',
+                 '--channel-order']
+        parts.extend(str(channel) for channel in channel_order)
+        parts.extend([inference_graph_uri, label_map_uri])
+        parts.extend(self.get_image_source_uris())
+        parts.append(predictions_uri)
+        command = ' '.join(shell_quote(part) for part in parts)
         job_id = rv_batch_client.start_raster_vision_job(job_name, command)
 
         return job_id
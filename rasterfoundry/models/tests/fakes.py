@@ -0,0 +1,11 @@
+class FakeResult(object):
+    """Stands in for a bravado future whose response is already known"""
+
+    def __init__(self, value, on_result=None):
+        self.value = value
+        self.on_result = on_result
+
+    def result(self):
+        if self.on_result is not None:
+            self.on_result()
+        return self.value
@@ -0,0 +1,41 @@
+import pytest
+
+from ..datasource import Datasource
+from ..project import Project
+from .fakes import FakeResult
+
+
+class FakeResource(object):
+    def __init__(self, api):
+        self.api = api
+
+    def __getattr__(self, name):
+        return lambda **kwargs: FakeResult(
+            name, on_result=lambda: self.api.calls.append('request'))
+
+
+class FakeAPI(object):
+    def __init__(self):
+        self.calls = []
+        self.client = self
+        self.Imagery = FakeResource(self)
+        self.Datasources = FakeResource(self)
+
+    def invalidate_cache(self):
+        self.calls.append('invalidate')
+
+
+@pytest.mark.parametrize('write', [
+    lambda api: Project.create(api, {}),
+    lambda api: Datasource.create(api, 'name', []),
+    lambda api: Datasource.update(api, 'id', {}),
+    lambda api: Datasource.delete(api, 'id'),
+])
+def test_writes_invalidate_cache_after_request(write):
+    api = FakeAPI()
+    write(api)
+    assert api.calls == ['request', 'invalidate']
+
+
+def test_project_create_returns_created_project():
+    assert Project.create(FakeAPI(), {}) == 'post_projects'
@@ -0,0 +1,56 @@
+import re
+from collections import namedtuple
+
+import pytest
+
+from ..project import Project
+
+ProjectModel = namedtuple('ProjectModel', ['id', 'name'])
+
+
+class FakeBatchClient(object):
+    def __init__(self):
+        self.jobs = []
+
+    def start_raster_vision_job(self, job_name, command):
+        self.jobs.append((job_name, command))
+        return 'job-id'
+
+
+@pytest.fixture
+def batch_client():
+    return FakeBatchClient()
+
+
+def make_project(source_uris):
+    project = Project(ProjectModel('project-id', 'A project'), None)
+    project.get_image_source_uris = lambda: source_uris
+    return project
+
+
+def test_start_predict_job_plain_uris(batch_client):
+    project = make_project(['s3://bucket/a.tif', 's3://bucket/b.tif'])
+    job_id = project.start_predict_job(
+        batch_client, 's3://bucket/graph.pb', 's3://bucket/labels.pbtxt',
+        's3://bucket/predictions.json')
+
+    assert job_id == 'job-id'
+    job_name, command = batch_client.jobs[0]
+    assert re.match(r'^predict_project_project-id_[0-9a-f]{32}$', job_name)
+    assert command == (
+        'python -m rv.detection.run predict --channel-order 0 1 2 '
+        's3://bucket/graph.pb s3://bucket/labels.pbtxt '
+        's3://bucket/a.tif s3://bucket/b.tif s3://bucket/predictions.json')
+
+
+def test_start_predict_job_quotes_uris_with_spaces(batch_client):
+    project = make_project(['s3://bucket/my image.tif'])
+    project.start_predict_job(
+        batch_client, 's3://bucket/graph.pb', 's3://bucket/labels.pbtxt',
+        's3://bucket/predictions.json', channel_order=[2, 1, 0, 3])
+
+    command = batch_client.jobs[0][1]
+    assert command == (
+        'python -m rv.detection.run predict --channel-order 2 1 0 3 '
+        "s3://bucket/graph.pb s3://bucket/labels.pbtxt "
+        "'s3://bucket/my image.tif' s3://bucket/predictions.json")
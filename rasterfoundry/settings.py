@@ -1,4 +1,13 @@
+import os
+
 RV_CPU_QUEUE = 'raster-vision-cpu'
 RV_CPU_JOB_DEF = 'raster-vision-cpu'
 RV_TEMP_URI = 's3://raster-vision-lf-dev/detection/rf-generated'
 DEVELOP_BRANCH = 'develop'
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 30
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'rasterfoundry')
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, 'http')
+HTTP_CACHE_EXPIRE_AFTER = 60
+HTTP_CACHE_MAX_AGE = 24 * 60 * 60
+SPEC_CACHE_DIR = os.path.join(CACHE_DIR, 'specs')
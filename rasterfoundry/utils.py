@@ -2,6 +2,8 @@ from future.standard_library import install_aliases  # noqa
 install_aliases()  # noqa
 import os
 import errno
+import math
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 
@@ -62,6 +64,49 @@ def mkdir_p(path):
             raise
 
 
+def iter_paginated(get_page_fn, list_field='results'):
+    """Iterate over objects from a paginated endpoint.
+
+    Pages are only requested once the objects from the previous page have
+    been consumed.
+
+    Args:
+        get_page_fn: function that takes a page number and returns results
+        list_field: field in the results that contains the list of objects
+
+    Yields:
+        Objects from a paginated endpoint
+    """
+    page = 0
+    while True:
+        paginated_results = get_page_fn(page)
+        for result in getattr(paginated_results, list_field):
+            yield result
+        if not paginated_results.hasNext:
+            return
+        page = paginated_results.page + 1
+
+
+def match_annotations_uris(project_ids, annotations_uris=None):
+    """Get one annotations URI per project for a project config.
+
+    Args:
+        project_ids: list of project ids to make training data from
+        annotations_uris: optional list of corresponding annotation URIs
+
+    Returns:
+        List of annotation URIs, with None for projects whose annotations
+        still need to be generated
+    """
+    if annotations_uris is None:
+        return [None] * len(project_ids)
+    if len(annotations_uris) != len(project_ids):
+        raise ValueError(
+            'Expected {} annotations URIs, one per project, got {}'.format(
+                len(project_ids), len(annotations_uris)))
+    return annotations_uris
+
+
 def get_all_paginated(get_page_fn, list_field='results'):
     """Get all objects from a paginated endpoint.
 
@@ -72,14 +117,67 @@ def get_all_paginated(get_page_fn, list_field='results'):
     Returns:
         List of all objects from a paginated endpoint
     """
-    has_next = True
-    all_results = []
-    page = 0
-    while has_next:
-        paginated_results = get_page_fn(page)
-        has_next = paginated_results.hasNext
-        page = paginated_results.page + 1
-        for result in getattr(paginated_results, list_field):
-            all_results.append(result)
+    return list(iter_paginated(get_page_fn, list_field))
+
+
+def get_remaining_pages(page, count, page_size):
+    """Get the page numbers after `page` needed to reach `count` objects.
+
+    Args:
+        page: number of the page that has already been fetched
+        count: total number of objects reported by the endpoint
+        page_size: number of objects per page
+
+    Returns:
+        List of page numbers, possibly empty
+    """
+    page_count = int(math.ceil(count / float(page_size)))
+    return list(range(page + 1, page_count))
 
+
+def get_all_paginated_parallel(get_page_fn, list_field='results',
+                               max_workers=8):
+    """Get all objects from a paginated endpoint, fetching pages concurrently.
+
+    The first page is fetched on its own to learn the total count and page
+    size, then the remaining pages are requested in parallel. Any pages that
+    appear after the count was read are fetched sequentially.
+
+    Args:
+        get_page_fn: function that takes a page number and returns results
+        list_field: field in the results that contains the list of objects
+        max_workers: maximum number of pages to request at once
+
+    Returns:
+        List of all objects from a paginated endpoint
+    """
+    paginated_results = get_page_fn(0)
+    if not paginated_results.hasNext:
+        return list(getattr(paginated_results, list_field))
+
+    # Preallocate from the total count and fill pages in by position. The
+    # count can change while paging, so trim or grow to what was returned.
+    all_results = [None] * paginated_results.count
+    filled = 0
+
+    def add_page(page, offset):
+        page_results = getattr(page, list_field)
+        all_results[offset:offset + len(page_results)] = page_results
+        return offset + len(page_results)
+
+    filled = add_page(paginated_results, filled)
+    remaining_pages = get_remaining_pages(
+        paginated_results.page, paginated_results.count,
+        paginated_results.pageSize)
+    if remaining_pages:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for paginated_results in executor.map(
+                    get_page_fn, remaining_pages):
+                filled = add_page(paginated_results, filled)
+
+    while paginated_results.hasNext:
+        paginated_results = get_page_fn(paginated_results.page + 1)
+        filled = add_page(paginated_results, filled)
+
+    del all_results[filled:]
     return all_results
@@ -24,9 +24,12 @@ setuptools.setup(
         'cryptography >= 2.0.0',
         'pyasn1 >= 0.2.3',
         'requests >= 2.9.1',
+        'urllib3 >= 1.15',
         'bravado >= 8.4.0',
+        'cachetools >= 2.0.0',
         'boto3 >= 1.4.4',
         'future >= 0.16.0',
+        'futures >= 3.0.0; python_version < "3.0"',
         'shapely >= 1.6.4post1'
     ],
     extras_require={
@@ -34,6 +37,12 @@ setuptools.setup(
             'notebook >= 4.0.0',
             'az-ipyleaflet==0.4.1'
         ],
+        'async': [
+            'aiohttp >= 3.0.0; python_version >= "3.5"'
+        ],
+        'cache': [
+            'requests-cache >= 0.7.0; python_version >= "3.6"'
+        ],
         'dev': [],
         'test': [],
     },
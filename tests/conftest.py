@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+import threading
+
+import pytest
+from bravado.swagger_model import load_file
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+import rasterfoundry.api
+
+# The async client needs async/await syntax
+if sys.version_info < (3, 5):
+    collect_ignore = ['test_async_api.py']
+
+LOCAL_SPEC_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'rasterfoundry', 'spec.yml'))
+
+
+@pytest.fixture
+def local_spec(monkeypatch):
+    """Use the spec shipped with the package instead of fetching it"""
+    monkeypatch.setitem(rasterfoundry.api._SPEC_CACHE,
+                        rasterfoundry.api.SPEC_PATH, load_file(LOCAL_SPEC_PATH))
+
+
+@pytest.fixture
+def http_server():
+    """Local HTTP server that answers GETs with `server.respond(path)`
+
+    `respond` returns a (status, body) tuple, where body is serialized as
+    JSON. Requests are recorded as (path, headers) in `server.requests`.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server.requests.append((self.path, dict(self.headers)))
+            status, body = server.respond(self.path)
+            body = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    server.requests = []
+    server.respond = lambda path: (200, {})
+    server.host = '127.0.0.1:{}'.format(server.server_address[1])
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
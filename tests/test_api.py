@@ -0,0 +1,235 @@
+import os
+import pickle
+import shutil
+import threading
+from collections import namedtuple
+
+import pytest
+
+from rasterfoundry.api import get_spec, load_spec_file
+from rasterfoundry.models.tests.fakes import FakeResult
+
+SPEC_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'rasterfoundry', 'spec.yml')
+
+
+@pytest.fixture
+def spec_cache_dir(monkeypatch, tmpdir):
+    cache_dir = tmpdir.join('cache')
+    monkeypatch.setattr('rasterfoundry.api.SPEC_CACHE_DIR', str(cache_dir))
+    return cache_dir
+
+
+def test_get_spec_returns_independent_copies(spec_cache_dir, tmpdir):
+    spec_path = tmpdir.join('spec.yml')
+    shutil.copy(SPEC_PATH, str(spec_path))
+    spec = get_spec(str(spec_path))
+    spec['host'] = 'example.com'
+    assert get_spec(str(spec_path))['host'] == 'app.rasterfoundry.com'
+
+
+def test_load_spec_file_writes_and_reuses_pickle(spec_cache_dir, tmpdir,
+                                                 monkeypatch):
+    spec_file = tmpdir.join('spec.yml')
+    spec_file.write('swagger: "2.0"\nhost: example.com\n')
+
+    assert load_spec_file(str(spec_file))['host'] == 'example.com'
+    assert len(spec_cache_dir.listdir()) == 1
+    assert not tmpdir.join('spec.pkl').check()
+
+    def fail_to_parse(path):
+        raise AssertionError('spec should have been loaded from the pickle')
+
+    with monkeypatch.context() as patch:
+        patch.setattr('rasterfoundry.api.load_file', fail_to_parse)
+        assert load_spec_file(str(spec_file))['host'] == 'example.com'
+
+
+def test_load_spec_file_ignores_pickle_of_replaced_spec(spec_cache_dir,
+                                                        tmpdir):
+    spec_file = tmpdir.join('spec.yml')
+    spec_file.write('swagger: "2.0"\nhost: example.com\n')
+    spec_file.setmtime(1000000)
+    assert load_spec_file(str(spec_file))['host'] == 'example.com'
+
+    # Swapped in with the same size and an older mtime, as `cp -p` or
+    # `tar x` would do
+    spec_file.write('swagger: "2.0"\nhost: elpmaxe.com\n')
+    spec_file.setmtime(999000)
+    assert load_spec_file(str(spec_file))['host'] == 'elpmaxe.com'
+    assert len(spec_cache_dir.listdir()) == 1
+
+
+def test_load_spec_file_ignores_pickle_next_to_spec(spec_cache_dir, tmpdir):
+    spec_file = tmpdir.join('spec.yml')
+    spec_file.write('swagger: "2.0"\nhost: example.com\n')
+    with open(str(tmpdir.join('spec.pkl')), 'wb') as pickle_file:
+        pickle.dump({'host': 'planted.example.com'}, pickle_file)
+
+    assert load_spec_file(str(spec_file))['host'] == 'example.com'
+
+
+def test_get_scenes_formats_bbox():
+    from shapely.geometry import box
+
+    from rasterfoundry.api import API
+
+    class FakeImagery(object):
+        def get_scenes(self, **kwargs):
+            return FakeResult(kwargs)
+
+    class FakeClient(object):
+        Imagery = FakeImagery()
+
+    api = API.__new__(API)
+    api.client = FakeClient()
+    api._response_cache = {}
+    api._response_cache_lock = threading.Lock()
+
+    assert api.get_scenes(bbox=(0, 1.5, 2, 3))['bbox'] == '0,1.5,2,3'
+    assert api.get_scenes(bbox=box(0, 1, 2, 3))['bbox'] == '0.0,1.0,2.0,3.0'
+    assert api.get_scenes(bbox='0,1,2,3')['bbox'] == '0,1,2,3'
+    assert 'bbox' not in api.get_scenes()
+    assert api.get_scenes(bbox=())['bbox'] == ()
+    assert api.get_scenes(bbox=[])['bbox'] == []
+    with pytest.raises(ValueError):
+        api.get_scenes(bbox=(0, 1, 2))
+
+
+def test_api_session_uses_pooled_retrying_adapter(local_spec, http_server):
+    from bravado.exception import HTTPServiceUnavailable
+
+    from rasterfoundry.api import API, HTTP_POOL_MAXSIZE
+
+    http_server.respond = lambda path: (503, {})
+    api = API(api_token='token', host=http_server.host, scheme='http')
+    adapter = api.http.session.get_adapter('http://' + http_server.host)
+    adapter.max_retries.backoff_factor = 0
+    assert adapter._pool_maxsize == HTTP_POOL_MAXSIZE
+    assert api.http.session.get_adapter('https://example.com') is adapter
+
+    # Once retries run out the last response is handed back to bravado
+    with pytest.raises(HTTPServiceUnavailable):
+        api.client.Imagery.get_projects(page=0).result()
+    assert len(http_server.requests) == 4
+
+
+def test_get_project_config_requires_annotations_uri_per_project():
+    from rasterfoundry.api import API
+
+    api = API.__new__(API)
+    with pytest.raises(ValueError):
+        api.get_project_config(['a', 'b', 'c'], ['s3://bucket/a.json'])
+
+
+def test_cache_installs_cached_session(local_spec, http_server, monkeypatch,
+                                       tmpdir):
+    requests_cache = pytest.importorskip('requests_cache')
+
+    from rasterfoundry.api import API, HTTP_POOL_MAXSIZE
+
+    cache_dir = tmpdir.join('http')
+    cache_dir.ensure(dir=True)
+    stale_cache = cache_dir.join('rf_api_cache_stale.sqlite')
+    stale_cache.write('')
+    stale_cache.setmtime(1)
+    recent_cache = cache_dir.join('rf_api_cache_recent.sqlite')
+    recent_cache.write('')
+    monkeypatch.setattr('rasterfoundry.api.HTTP_CACHE_DIR', str(cache_dir))
+
+    api = API(api_token='token', host=http_server.host, scheme='http',
+              cache=True)
+    session = api.http.session
+    assert isinstance(session, requests_cache.CachedSession)
+    assert session.headers['Authorization'] == 'Bearer token'
+    adapter = session.get_adapter('http://' + http_server.host)
+    assert adapter._pool_maxsize == HTTP_POOL_MAXSIZE
+    assert not stale_cache.check()
+    assert recent_cache.check()
+
+    http_server.respond = lambda path: (200, {
+        'count': 0, 'hasNext': False, 'hasPrevious': False, 'page': 0,
+        'pageSize': 10, 'results': []})
+    for _ in range(2):
+        api.client.Imagery.get_projects(page=0).result()
+    assert len(http_server.requests) == 1
+    assert http_server.requests[0][1]['Authorization'] == 'Bearer token'
+
+
+class FakeParam(object):
+    def __init__(self, name, param_spec):
+        self.name = name
+        self.param_spec = param_spec
+
+
+class FakeProjectsClient(object):
+    """Stands in for the bravado client's project endpoints"""
+
+    Page = namedtuple('Page', ['count', 'hasNext', 'page', 'pageSize',
+                               'results'])
+    Model = namedtuple('Model', ['id', 'name'])
+
+    def __init__(self, params, listed_ids):
+        operation = namedtuple('Operation', ['params'])(params)
+        resource = namedtuple('Resource', ['operations'])(
+            {'get_projects': operation})
+        self.swagger_spec = namedtuple('Spec', ['resources'])(
+            {'Imagery': resource})
+        self.Imagery = self
+        self.listed_ids = listed_ids
+        self.list_calls = []
+        self.get_calls = []
+
+    def model(self, project_id):
+        return self.Model(project_id, 'project {}'.format(project_id))
+
+    def get_projects(self, page, **kwargs):
+        self.list_calls.append(kwargs)
+        # Return listed projects in reverse to check reordering
+        page_results = self.Page(
+            count=len(self.listed_ids), hasNext=False, page=page, pageSize=10,
+            results=[self.model(i) for i in reversed(self.listed_ids)])
+        return FakeResult(page_results)
+
+    def get_projects_projectID(self, projectID):
+        self.get_calls.append(projectID)
+        return FakeResult(self.model(projectID))
+
+
+def make_projects_api(params, listed_ids=()):
+    from rasterfoundry.api import API
+
+    api = API.__new__(API)
+    api.client = FakeProjectsClient(params, list(listed_ids))
+    return api
+
+
+@pytest.mark.parametrize('param_spec,ids_filter', [
+    ({'type': 'array', 'items': {'type': 'string'}}, ['b', 'a', 'c']),
+    ({'type': 'string'}, 'b,a,c'),
+])
+def test_get_projects_by_id_uses_filtered_listing(param_spec, ids_filter):
+    api = make_projects_api({'ids': FakeParam('ids', param_spec)},
+                            listed_ids=['a', 'b', 'c'])
+    projects = api.get_projects_by_id(['b', 'a', 'c', 'a'])
+    assert [p.id for p in projects] == ['b', 'a', 'c', 'a']
+    assert api.client.list_calls == [{'ids': ids_filter}]
+    assert api.client.get_calls == []
+
+
+def test_get_projects_by_id_fetches_ids_missing_from_listing():
+    api = make_projects_api(
+        {'ids': FakeParam('ids', {'type': 'string'})}, listed_ids=['a'])
+    projects = api.get_projects_by_id(['c', 'a', 'b'])
+    assert [p.id for p in projects] == ['c', 'a', 'b']
+    assert sorted(api.client.get_calls) == ['b', 'c']
+
+
+def test_get_projects_by_id_without_filter_param():
+    api = make_projects_api({'page': FakeParam('page', {'type': 'integer'})})
+    projects = api.get_projects_by_id(['b', 'a', 'b'])
+    assert [p.id for p in projects] == ['b', 'a', 'b']
+    assert [p.name for p in projects] == ['project b', 'project a',
+                                          'project b']
+    assert api.client.list_calls == []
+    assert sorted(api.client.get_calls) == ['a', 'b']
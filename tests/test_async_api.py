@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from rasterfoundry.async_api import AsyncAPI  # noqa: E402
+from rasterfoundry.models import Project  # noqa: E402
+
+PAGE_SIZE = 5
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def make_app(projects, requested_pages, reported_count=None):
+    async def list_projects(request):
+        page = int(request.query['page'])
+        requested_pages.append(page)
+        start = page * PAGE_SIZE
+        return web.json_response({
+            'count': (len(projects) if reported_count is None
+                      else reported_count),
+            'hasNext': start + PAGE_SIZE < len(projects),
+            'hasPrevious': page > 0,
+            'page': page,
+            'pageSize': PAGE_SIZE,
+            'results': projects[start:start + PAGE_SIZE]
+        })
+
+    async def get_project(request):
+        project_id = request.match_info['id']
+        # Answer later ids first so responses arrive out of order
+        await asyncio.sleep(0.01 * (10 - int(project_id)))
+        return web.json_response({'id': project_id,
+                                  'name': 'project {}'.format(project_id)})
+
+    app = web.Application()
+    app.router.add_get('/api/projects/', list_projects)
+    app.router.add_get('/api/projects/{id}/', get_project)
+    return app
+
+
+def with_api(app, test):
+    async def run_test():
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            host = '{}:{}'.format(server.host, server.port)
+            async with AsyncAPI(api_token='token', host=host,
+                                scheme='http') as api:
+                return await test(api)
+        finally:
+            await server.close()
+    return run(run_test())
+
+
+def project_dicts(count):
+    return [{'id': str(i), 'name': 'project {}'.format(i)}
+            for i in range(count)]
+
+
+def test_get_all_paginated_gathers_remaining_pages(local_spec):
+    projects = project_dicts(23)
+    requested_pages = []
+
+    async def test(api):
+        return await api._get_all_paginated('/projects/')
+
+    results = with_api(make_app(projects, requested_pages), test)
+    assert results == projects
+    assert requested_pages[0] == 0
+    assert sorted(requested_pages) == [0, 1, 2, 3, 4]
+
+
+def test_get_all_paginated_follows_has_next_past_count(local_spec):
+    projects = project_dicts(23)
+    requested_pages = []
+
+    async def test(api):
+        return await api._get_all_paginated('/projects/')
+
+    app = make_app(projects, requested_pages, reported_count=10)
+    assert with_api(app, test) == projects
+    assert requested_pages == [0, 1, 2, 3, 4]
+
+
+def test_to_model_returns_spec_models(local_spec):
+    async def test(api):
+        return api._to_model('Project', {'id': 'abc', 'name': 'A project'})
+
+    model = with_api(make_app([], []), test)
+    project = Project(model, None)
+    assert (project.id, project.name) == ('abc', 'A project')
+
+
+def test_get_project_config_preserves_order(local_spec):
+    async def test(api):
+        def build_project_config(project_id, proj, annotations_uri=None):
+            return {'id': project_id, 'name': proj.name,
+                    'annotations': annotations_uri}
+
+        api.api._build_project_config = build_project_config
+        return await api.get_project_config(
+            ['1', '5', '3'], ['s3://a/1', 's3://a/5', 's3://a/3'])
+
+    assert with_api(make_app([], []), test) == [
+        {'id': '1', 'name': 'project 1', 'annotations': 's3://a/1'},
+        {'id': '5', 'name': 'project 5', 'annotations': 's3://a/5'},
+        {'id': '3', 'name': 'project 3', 'annotations': 's3://a/3'},
+    ]
+
+
+def test_get_project_config_requires_annotations_uri_per_project(local_spec):
+    async def test(api):
+        with pytest.raises(ValueError):
+            await api.get_project_config(['1', '2'], ['s3://a/1'])
+
+    with_api(make_app([], []), test)
+
+
+def test_paths_come_from_spec(local_spec):
+    async def test(api):
+        return (api._get_path('get_map_tokens'), api._get_path('get_projects'),
+                api._project_path)
+
+    assert with_api(make_app([], []), test) == (
+        '/map-tokens/', '/projects/', '/projects/{}/')
@@ -0,0 +1,38 @@
+import threading
+
+from cachetools import TTLCache
+
+from rasterfoundry.decorators import cached_response
+
+
+class FakeAPI(object):
+    def __init__(self):
+        self._response_cache = TTLCache(maxsize=10, ttl=60)
+        self._response_cache_lock = threading.Lock()
+        self.calls = 0
+
+    @cached_response
+    def get_things(self, **kwargs):
+        self.calls += 1
+        return [self.calls]
+
+
+def test_cached_response_reuses_result():
+    api = FakeAPI()
+    assert api.get_things(page=0) == [1]
+    assert api.get_things(page=0) == [1]
+    assert api.get_things(page=1) == [2]
+    assert api.calls == 2
+
+
+def test_cached_response_returns_copies():
+    api = FakeAPI()
+    api.get_things().append('mutated')
+    assert api.get_things() == [1]
+
+
+def test_cached_response_skips_unhashable_arguments():
+    api = FakeAPI()
+    api.get_things(bbox=[0, 0, 1, 1])
+    api.get_things(bbox=[0, 0, 1, 1])
+    assert api.calls == 2
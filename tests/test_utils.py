@@ -0,0 +1,79 @@
+from collections import namedtuple
+
+from rasterfoundry.utils import (
+    get_all_paginated_parallel,
+    get_remaining_pages,
+    iter_paginated,
+)
+
+Page = namedtuple('Page', ['count', 'hasNext', 'page', 'pageSize', 'results'])
+
+
+def make_get_page(items, page_size):
+    requested = []
+
+    def get_page(page):
+        requested.append(page)
+        start = page * page_size
+        return Page(count=len(items), hasNext=start + page_size < len(items),
+                    page=page, pageSize=page_size,
+                    results=items[start:start + page_size])
+    return get_page, requested
+
+
+def test_parallel_pagination_preserves_order():
+    items = list(range(53))
+    get_page, requested = make_get_page(items, 10)
+    assert get_all_paginated_parallel(get_page, max_workers=4) == items
+    assert sorted(requested) == list(range(6))
+
+
+def test_parallel_pagination_single_page():
+    items = list(range(3))
+    get_page, requested = make_get_page(items, 10)
+    assert get_all_paginated_parallel(get_page) == items
+    assert requested == [0]
+
+
+def test_parallel_pagination_fetches_pages_added_after_count():
+    items = list(range(25))
+    get_page, requested = make_get_page(items, 10)
+
+    def get_page_growing(page):
+        paginated = get_page(page)
+        if page == 0:
+            items.extend(range(25, 35))
+        return paginated._replace(count=25) if page == 0 else paginated
+
+    assert get_all_paginated_parallel(get_page_growing) == list(range(35))
+    assert sorted(requested) == [0, 1, 2, 3]
+
+
+def test_parallel_pagination_handles_shrinking_results():
+    items = list(range(25))
+    get_page, requested = make_get_page(items, 10)
+
+    def get_page_shrinking(page):
+        paginated = get_page(page)
+        if page == 0:
+            del items[20:]
+        return paginated._replace(count=25) if page == 0 else paginated
+
+    assert get_all_paginated_parallel(get_page_shrinking) == list(range(20))
+
+
+def test_iter_paginated_requests_pages_lazily():
+    items = list(range(25))
+    get_page, requested = make_get_page(items, 10)
+    results = iter_paginated(get_page)
+    assert [next(results) for _ in range(10)] == items[:10]
+    assert requested == [0]
+    assert list(results) == items[10:]
+    assert requested == [0, 1, 2]
+
+
+def test_get_remaining_pages():
+    assert get_remaining_pages(0, 53, 10) == [1, 2, 3, 4, 5]
+    assert get_remaining_pages(0, 50, 10) == [1, 2, 3, 4]
+    assert get_remaining_pages(0, 7, 10) == []
+    assert get_remaining_pages(2, 53, 10) == [3, 4, 5]